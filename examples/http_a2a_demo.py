@@ -1,6 +1,7 @@
 """
 Demo script showing HTTP A2A monitoring.
 """
+import asyncio
 import os
 import time
 
@@ -9,6 +10,23 @@ import requests
 import httpx
 
 
+# Pool limits shared by the demo's httpx clients; each asyncio.run opens one
+# AsyncClient whose requests share its connection pool
+HTTPX_LIMITS = httpx.Limits(max_keepalive_connections=20, max_connections=100)
+
+
+async def call_httpbin() -> None:
+    async with httpx.AsyncClient(limits=HTTPX_LIMITS, timeout=httpx.Timeout(5.0)) as client:
+        # HTTPBin API, GET and POST sent concurrently over the shared pool
+        get_response, post_response = await asyncio.gather(
+            client.get("https://httpbin.org/json"),
+            client.post("https://httpbin.org/post",
+                        json={"agent": "test", "data": "sample"}),
+        )
+    print(f"HTTPBin API: {get_response.status_code}")
+    print(f"HTTPBin POST: {post_response.status_code}")
+
+
 def main() -> None:
     server = os.environ.get("AGENTOPS_URL", "http://localhost:8000")
     
@@ -40,15 +58,7 @@ def main() -> None:
             # Test httpx library
             print("📡 Making requests with httpx...")
             
-            with httpx.Client() as client:
-                # HTTPBin API
-                response = client.get("https://httpbin.org/json")
-                print(f"HTTPBin API: {response.status_code}")
-                
-                # Test POST with data
-                response = client.post("https://httpbin.org/post", 
-                                     json={"agent": "test", "data": "sample"})
-                print(f"HTTPBin POST: {response.status_code}")
+            asyncio.run(call_httpbin())
             
             # Test error handling
             print("📡 Testing error handling...")
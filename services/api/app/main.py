@@ -1,15 +1,30 @@
 from __future__ import annotations
 
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from .db import Base, engine
+from .db import init_db
 from .models import Event, Run
 from .routes import router
+from .writer import start_writer, stop_writer
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    # Create tables on startup
+    await init_db()
+    start_writer()
+    try:
+        yield
+    finally:
+        await stop_writer()
 
 
 def create_app() -> FastAPI:
-    app = FastAPI(title="AgentOps API", version="0.1.0")
+    app = FastAPI(title="AgentOps API", version="0.1.0", lifespan=lifespan)
     app.add_middleware(
         CORSMiddleware,
         allow_origins=["*"],
@@ -18,13 +33,8 @@ def create_app() -> FastAPI:
         allow_headers=["*"],
     )
 
-    # Create tables on startup
-    Base.metadata.create_all(bind=engine)
-
     app.include_router(router)
     return app
 
 
 app = create_app()
-
-
@@ -3,7 +3,7 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import Column, DateTime, Float, ForeignKey, Integer, String, Text, JSON
+from sqlalchemy import BigInteger, Column, DateTime, Float, ForeignKey, Index, Integer, SmallInteger, String, Text, JSON
 from sqlalchemy.orm import relationship
 
 from .db import Base
@@ -13,20 +13,25 @@ class Run(Base):
     __tablename__ = "runs"
 
     id = Column(String, primary_key=True, index=True)
-    project = Column(String, index=True, nullable=False)
-    started_at = Column(Integer, nullable=False)  # epoch ms
-    ended_at = Column(Integer, nullable=True)  # epoch ms
+    project = Column(String, nullable=False)
+    started_at = Column(BigInteger, nullable=False)  # epoch ms
+    ended_at = Column(BigInteger, nullable=True)  # epoch ms
     status = Column(String, nullable=False, default="running")  # running|completed|terminated
     termination_reason = Column(String, nullable=True)
+    total_cost_usd = Column(Float, nullable=False, default=0.0, server_default="0")  # sum of llm_call cost_usd
 
     events = relationship("Event", back_populates="run", cascade="all, delete-orphan")
+    a2a_events = relationship("A2AEvent", back_populates="run", cascade="all, delete-orphan")
+
+    # list_runs: filter by project, newest first, without a sort step
+    __table_args__ = (Index("ix_runs_project_started_at", "project", started_at.desc()),)
 
 
 class Event(Base):
     __tablename__ = "events"
 
     id = Column(Integer, primary_key=True, index=True)
-    run_id = Column(String, ForeignKey("runs.id"), index=True, nullable=False)
+    run_id = Column(String, ForeignKey("runs.id"), nullable=False)
     seq = Column(Integer, nullable=True)
     type = Column(String, nullable=False)
     model = Column(String, nullable=True)
@@ -36,27 +41,37 @@ class Event(Base):
     completion_tokens = Column(Integer, nullable=True)
     total_tokens = Column(Integer, nullable=True)
     cost_usd = Column(Float, nullable=True)
-    created_at = Column(Integer, nullable=True)
+    created_at = Column(BigInteger, nullable=True)
 
     run = relationship("Run", back_populates="events")
 
+    # get_run: one run's events in id order as a range scan
+    __table_args__ = (Index("ix_events_run_id_id", "run_id", "id"),)
+
+
+# The SDK truncates A2A payloads to 1000 chars plus a marker; anything longer
+# is cut at ingest so a single event cannot bloat the table.
+A2A_PAYLOAD_MAX_CHARS = 1024
+
 
 class A2AEvent(Base):
     __tablename__ = "a2a_events"
 
     id = Column(Integer, primary_key=True, index=True)
-    run_id = Column(String, ForeignKey("runs.id"), index=True, nullable=False)
+    run_id = Column(String, ForeignKey("runs.id"), nullable=False)
     type = Column(String, nullable=False)  # a2a_http_call, a2a_db_query, etc.
     method = Column(String, nullable=True)  # GET, POST, etc.
     url = Column(Text, nullable=True)  # Full URL
     service_name = Column(String, nullable=True)  # Clean service name
-    request_data = Column(Text, nullable=True)  # Request payload
-    response_data = Column(Text, nullable=True)  # Response payload
-    status_code = Column(Integer, nullable=True)  # HTTP status code
+    request_data = Column(String(A2A_PAYLOAD_MAX_CHARS), nullable=True)  # Request payload
+    response_data = Column(String(A2A_PAYLOAD_MAX_CHARS), nullable=True)  # Response payload
+    status_code = Column(SmallInteger, nullable=True)  # HTTP status code
     duration_ms = Column(Float, nullable=True)  # Request duration
     error = Column(Text, nullable=True)  # Error message if failed
-    created_at = Column(Integer, nullable=True)  # Epoch milliseconds
+    created_at = Column(BigInteger, nullable=True)  # Epoch milliseconds
+
+    run = relationship("Run", back_populates="a2a_events")
 
-    run = relationship("Run")
+    __table_args__ = (Index("ix_a2a_events_run_id_id", "run_id", "id"),)
 
 
@@ -1,31 +1,35 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import func, select
-from sqlalchemy.orm import Session
+import brotli
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+import msgspec
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from .db import SessionLocal
-from .models import Event, Run, A2AEvent
-from .schemas import EventIn, A2AEventIn, RunDetail, RunSummary
+from .db import AsyncSessionLocal, WriteSessionLocal
+from .models import A2A_PAYLOAD_MAX_CHARS, Event, Run, A2AEvent
+from .schemas import EventIn, A2AEventIn, EventBatchIn, RunDetail, RunSummary
+from .writer import submit
 
 
 router = APIRouter()
 
 
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_db() -> AsyncIterator[AsyncSession]:
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
 
-@router.post("/v1/events")
-def ingest_event(payload: EventIn, db: Session = Depends(get_db)) -> dict:
+async def get_write_db() -> AsyncIterator[AsyncSession]:
+    async with WriteSessionLocal() as db:
+        yield db
+
+
+async def _apply_event(db: AsyncSession, payload: EventIn) -> None:
     if payload.type == "run_started":
-        run = db.get(Run, payload.run_id)
+        run = await db.get(Run, payload.run_id)
         if run is None:
             run = Run(
                 id=payload.run_id,
@@ -34,10 +38,11 @@ def ingest_event(payload: EventIn, db: Session = Depends(get_db)) -> dict:
                 status="running",
             )
             db.add(run)
-            db.commit()
-        return {"ok": True}
+            # Make the run visible to later events committed in the same batch
+            await db.flush()
+        return
 
-    run = db.get(Run, payload.run_id)
+    run = await db.get(Run, payload.run_id)
     if run is None:
         raise HTTPException(status_code=400, detail="run_id not found; send run_started first")
 
@@ -56,171 +61,296 @@ def ingest_event(payload: EventIn, db: Session = Depends(get_db)) -> dict:
             created_at=payload.created_at,
         )
         db.add(evt)
-        db.commit()
-        return {"ok": True}
+        if payload.cost_usd:
+            await db.execute(
+                update(Run)
+                .where(Run.id == payload.run_id)
+                .values(total_cost_usd=Run.total_cost_usd + payload.cost_usd)
+                .execution_options(synchronize_session=False)
+            )
+        return
 
     if payload.type == "run_terminated":
         run.status = "terminated"
         run.termination_reason = payload.reason
         run.ended_at = payload.terminated_at
         db.add(run)
-        db.commit()
-        return {"ok": True}
+        return
 
     if payload.type == "run_completed":
         run.status = "completed"
         run.ended_at = payload.ended_at
         db.add(run)
-        db.commit()
-        return {"ok": True}
+        return
 
     raise HTTPException(status_code=400, detail="unknown event type")
 
 
-@router.post("/v1/a2a-events")
-def ingest_a2a_event(payload: A2AEventIn, db: Session = Depends(get_db)) -> dict:
-    """Ingest A2A communication events."""
+def _cap_payload(value: Optional[str]) -> Optional[str]:
+    if value is None or len(value) <= A2A_PAYLOAD_MAX_CHARS:
+        return value
+    return value[:A2A_PAYLOAD_MAX_CHARS]
+
+
+async def _apply_a2a_event(db: AsyncSession, payload: A2AEventIn) -> None:
     # Verify run exists
-    run = db.get(Run, payload.run_id)
+    run = await db.get(Run, payload.run_id)
     if run is None:
         raise HTTPException(status_code=400, detail="run_id not found")
-    
-    # Create A2A event
-    a2a_event = A2AEvent(
-        run_id=payload.run_id,
-        type=payload.type,
-        method=payload.method,
-        url=payload.url,
-        service_name=payload.service_name,
-        request_data=payload.request_data,
-        response_data=payload.response_data,
-        status_code=payload.status_code,
-        duration_ms=payload.duration_ms,
-        error=payload.error,
-        created_at=payload.created_at,
+
+    db.add(
+        A2AEvent(
+            run_id=payload.run_id,
+            type=payload.type,
+            method=payload.method,
+            url=payload.url,
+            service_name=payload.service_name,
+            request_data=_cap_payload(payload.request_data),
+            response_data=_cap_payload(payload.response_data),
+            status_code=payload.status_code,
+            duration_ms=payload.duration_ms,
+            error=payload.error,
+            created_at=payload.created_at,
+        )
     )
-    
-    db.add(a2a_event)
-    db.commit()
-    
+
+
+async def _apply_batch(db: AsyncSession, events: List[Dict[str, Any]]) -> Dict[str, int]:
+    accepted = 0
+    for raw in events:
+        try:
+            # One bad event must not cost the rest of the batch: each is
+            # applied and flushed in its own savepoint, so a database error
+            # rolls back only that event.
+            async with db.begin_nested():
+                if str(raw.get("type", "")).startswith("a2a_"):
+                    await _apply_a2a_event(db, msgspec.convert(raw, A2AEventIn))
+                else:
+                    await _apply_event(db, msgspec.convert(raw, EventIn))
+                await db.flush()
+        except Exception:
+            continue
+        accepted += 1
+    return {"accepted": accepted, "rejected": len(events) - accepted}
+
+
+_event_decoder = msgspec.json.Decoder(EventIn)
+_a2a_event_decoder = msgspec.json.Decoder(A2AEventIn)
+_batch_decoder = msgspec.json.Decoder(EventBatchIn)
+
+
+def _decode(decoder: msgspec.json.Decoder, body: bytes) -> Any:
+    try:
+        return decoder.decode(body)
+    except msgspec.DecodeError as e:
+        # ValidationError is a DecodeError too; both map to FastAPI's 422
+        raise HTTPException(status_code=422, detail=str(e))
+
+
+@router.post("/v1/events")
+async def ingest_event(request: Request) -> dict:
+    payload = _decode(_event_decoder, await request.body())
+    await submit(_apply_event, payload)
     return {"ok": True}
 
 
+@router.post("/v1/a2a-events")
+async def ingest_a2a_event(request: Request) -> dict:
+    """Ingest A2A communication events."""
+    payload = _decode(_a2a_event_decoder, await request.body())
+    await submit(_apply_a2a_event, payload)
+    return {"ok": True}
+
+
+# A full SDK batch (256 events of ~2 KB) is well under this
+MAX_BATCH_BODY_BYTES = 8 * 1024 * 1024
+_BROTLI_CHUNK_BYTES = 256 * 1024
+
+
+def _decompress_brotli(body: bytes) -> bytes:
+    """Decompress in bounded chunks so a small body cannot expand without limit."""
+    decompressor = brotli.Decompressor()
+    chunks: List[bytes] = []
+    size = 0
+    data = body
+    try:
+        while True:
+            chunk = decompressor.process(data, output_buffer_limit=_BROTLI_CHUNK_BYTES)
+            size += len(chunk)
+            if size > MAX_BATCH_BODY_BYTES:
+                raise HTTPException(status_code=413, detail="batch body too large")
+            chunks.append(chunk)
+            if decompressor.is_finished():
+                return b"".join(chunks)
+            if not chunk and not data:
+                # All input consumed without reaching the end of the stream
+                raise HTTPException(status_code=400, detail="invalid brotli body")
+            data = b""
+    except brotli.error:
+        raise HTTPException(status_code=400, detail="invalid brotli body")
+
+
+@router.post("/v1/events/batch")
+async def ingest_event_batch(request: Request) -> dict:
+    """Ingest a batch of run and A2A events in a single transaction.
+
+    The body may be Brotli-compressed (``Content-Encoding: br``).
+    """
+    body = await request.body()
+    if request.headers.get("content-encoding", "").lower() == "br":
+        body = _decompress_brotli(body)
+    elif len(body) > MAX_BATCH_BODY_BYTES:
+        raise HTTPException(status_code=413, detail="batch body too large")
+    payload = _decode(_batch_decoder, body)
+    counts = await submit(_apply_batch, payload.events)
+    return {"ok": True, **counts}
+
+
+def _run_summary(run: Run) -> Dict[str, Any]:
+    # Plain dicts: response_model validates and serializes them to JSON bytes
+    # in pydantic-core, so building model instances here would be done twice.
+    return {
+        "id": run.id,
+        "project": run.project,
+        "started_at": run.started_at,
+        "ended_at": run.ended_at,
+        "status": run.status,
+        "termination_reason": run.termination_reason,
+        "total_cost_usd": run.total_cost_usd or 0.0,
+    }
+
+
 @router.get("/v1/runs", response_model=List[RunSummary])
-def list_runs(
-    db: Session = Depends(get_db),
+async def list_runs(
+    db: AsyncSession = Depends(get_db),
     project: Optional[str] = Query(default=None),
     limit: int = Query(default=50, le=200),
 ):
-    q = db.query(Run)
+    q = select(Run)
     if project:
-        q = q.filter(Run.project == project)
+        q = q.where(Run.project == project)
     q = q.order_by(Run.started_at.desc()).limit(limit)
-    runs: List[Run] = q.all()
-
-    # Aggregate costs per run
-    result: List[RunSummary] = []
-    for r in runs:
-        total_cost = (
-            db.query(func.coalesce(func.sum(Event.cost_usd), 0.0))
-            .filter(Event.run_id == r.id)
-            .scalar()
-            or 0.0
+    runs: List[Run] = list((await db.scalars(q)).all())
+
+    return [_run_summary(r) for r in runs]
+
+
+# Events are paged LLM calls first, then A2A events, each in insertion order.
+# The cursor is "<kind>:<id>" of the last event on the previous page.
+_LLM_KIND = 0
+_A2A_KIND = 1
+
+
+def _parse_cursor(cursor: Optional[str]) -> Tuple[int, int]:
+    if not cursor:
+        return _LLM_KIND, 0
+    try:
+        kind, _, last_id = cursor.partition(":")
+        parsed = int(kind), int(last_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="invalid cursor")
+    if parsed[0] not in (_LLM_KIND, _A2A_KIND):
+        raise HTTPException(status_code=400, detail="invalid cursor")
+    return parsed
+
+
+def _llm_events_query(run_id: str, after_id: int, limit: int):
+    return (
+        select(
+            Event.id,
+            Event.type,
+            Event.model,
+            Event.prompt,
+            Event.response,
+            Event.prompt_tokens,
+            Event.completion_tokens,
+            Event.total_tokens,
+            Event.cost_usd,
+            Event.created_at,
         )
-        result.append(
-            RunSummary(
-                id=r.id,
-                project=r.project,
-                started_at=r.started_at,
-                ended_at=r.ended_at,
-                status=r.status,
-                termination_reason=r.termination_reason,
-                total_cost_usd=float(total_cost),
-            )
+        .where(Event.run_id == run_id, Event.id > after_id)
+        .order_by(Event.id)
+        .limit(limit)
+        .execution_options(yield_per=500)
+    )
+
+
+def _a2a_events_query(run_id: str, after_id: int, limit: int):
+    return (
+        select(
+            A2AEvent.id,
+            A2AEvent.type,
+            A2AEvent.method,
+            A2AEvent.url,
+            A2AEvent.service_name,
+            A2AEvent.request_data,
+            A2AEvent.response_data,
+            A2AEvent.status_code,
+            A2AEvent.duration_ms,
+            A2AEvent.error,
+            A2AEvent.created_at,
         )
-    return result
+        .where(A2AEvent.run_id == run_id, A2AEvent.id > after_id)
+        .order_by(A2AEvent.id)
+        .limit(limit)
+        .execution_options(yield_per=500)
+    )
+
+
+def _event_row_to_dict(kind: int, row) -> Dict[str, Any]:
+    if kind == _LLM_KIND:
+        return dict(row)
+    return {**row, "id": f"a2a_{row['id']}"}
 
 
 @router.get("/v1/runs/{run_id}", response_model=RunDetail)
-def get_run(run_id: str, db: Session = Depends(get_db)):
-    run = db.get(Run, run_id)
+async def get_run(
+    run_id: str,
+    db: AsyncSession = Depends(get_db),
+    limit: int = Query(default=500, ge=1, le=1000),
+    cursor: Optional[str] = Query(default=None),
+):
+    run = await db.get(Run, run_id)
     if run is None:
         raise HTTPException(status_code=404, detail="run not found")
-    # Get both regular events and A2A events
-    events = (
-        db.query(Event)
-        .filter(Event.run_id == run_id)
-        .order_by(Event.id.asc())
-        .all()
-    )
-    
-    a2a_events = (
-        db.query(A2AEvent)
-        .filter(A2AEvent.run_id == run_id)
-        .order_by(A2AEvent.id.asc())
-        .all()
-    )
 
-    total_cost = (
-        db.query(func.coalesce(func.sum(Event.cost_usd), 0.0))
-        .filter(Event.run_id == run_id)
-        .scalar()
-        or 0.0
-    )
+    after_kind, after_id = _parse_cursor(cursor)
+    pages = [(_A2A_KIND, _a2a_events_query)]
+    if after_kind == _LLM_KIND:
+        pages.insert(0, (_LLM_KIND, _llm_events_query))
 
-    return RunDetail(
-        id=run.id,
-        project=run.project,
-        started_at=run.started_at,
-        ended_at=run.ended_at,
-        status=run.status,
-        termination_reason=run.termination_reason,
-        total_cost_usd=float(total_cost),
-        events=[
-            {
-                "id": e.id,
-                "type": e.type,
-                "model": e.model,
-                "prompt": e.prompt,
-                "response": e.response,
-                "prompt_tokens": e.prompt_tokens,
-                "completion_tokens": e.completion_tokens,
-                "total_tokens": e.total_tokens,
-                "cost_usd": e.cost_usd,
-                "created_at": e.created_at,
-            }
-            for e in events
-        ] + [
-            {
-                "id": f"a2a_{ae.id}",
-                "type": ae.type,
-                "method": ae.method,
-                "url": ae.url,
-                "service_name": ae.service_name,
-                "request_data": ae.request_data,
-                "response_data": ae.response_data,
-                "status_code": ae.status_code,
-                "duration_ms": ae.duration_ms,
-                "error": ae.error,
-                "created_at": ae.created_at,
-            }
-            for ae in a2a_events
-        ],
-    )
+    # Each table is read as an index range scan in id order, so no sort is
+    # needed; one extra row tells whether another page follows.
+    events: List[Dict[str, Any]] = []
+    next_cursor: Optional[str] = None
+    for kind, query in pages:
+        last_id = after_id if kind == after_kind else 0
+        room = limit - len(events)
+        result = await db.stream(query(run_id, last_id, room + 1))
+        async for row in result.mappings():
+            if room == 0:
+                next_cursor = f"{kind}:{last_id}"
+                break
+            events.append(_event_row_to_dict(kind, row))
+            last_id = row["id"]
+            room -= 1
+        await result.close()
+        if next_cursor is not None:
+            break
+
+    return {**_run_summary(run), "events": events, "next_cursor": next_cursor}
 
 
 @router.delete("/v1/runs/{run_id}")
-def delete_run(run_id: str, db: Session = Depends(get_db)) -> dict:
+async def delete_run(run_id: str, db: AsyncSession = Depends(get_write_db)) -> dict:
     """Delete a run and all its associated events."""
     # Check if run exists
-    run = db.get(Run, run_id)
+    run = await db.get(Run, run_id)
     if run is None:
         raise HTTPException(status_code=404, detail="run not found")
-    
-    # Delete the run (cascade will handle events and A2A events)
-    db.delete(run)
-    db.commit()
-    
-    return {"ok": True, "message": f"Run {run_id} deleted successfully"}
 
+    # Delete the run (cascade will handle events and A2A events)
+    await db.delete(run)
+    await db.commit()
 
+    return {"ok": True, "message": f"Run {run_id} deleted successfully"}
@@ -1,11 +1,14 @@
 from __future__ import annotations
 
-from typing import Literal, Optional
+from typing import Annotated, Any, Dict, List, Literal, Optional
 
+import msgspec
 from pydantic import BaseModel, Field
 
 
-class EventIn(BaseModel):
+# Ingest payloads are msgspec Structs: the routes decode and validate the raw
+# body in one native pass instead of going through pydantic.
+class EventIn(msgspec.Struct):
     type: Literal["run_started", "llm_call", "run_terminated", "run_completed"]
     run_id: str
     project: Optional[str] = None
@@ -28,7 +31,12 @@ class EventIn(BaseModel):
     reason: Optional[str] = None
 
 
-class A2AEventIn(BaseModel):
+# Fits A2AEvent.status_code (SmallInteger); anything else is a 422, not a
+# database error
+HttpStatusCode = Annotated[int, msgspec.Meta(ge=0, le=999)]
+
+
+class A2AEventIn(msgspec.Struct):
     run_id: str
     type: str  # a2a_http_call, a2a_db_query, etc.
     method: Optional[str] = None
@@ -36,12 +44,17 @@ class A2AEventIn(BaseModel):
     service_name: Optional[str] = None
     request_data: Optional[str] = None
     response_data: Optional[str] = None
-    status_code: Optional[int] = None
+    status_code: Optional[HttpStatusCode] = None
     duration_ms: Optional[float] = None
     error: Optional[str] = None
     created_at: Optional[int] = None
 
 
+class EventBatchIn(msgspec.Struct):
+    # Mixed run and a2a_* events, applied in order
+    events: List[Dict[str, Any]]
+
+
 class RunSummary(BaseModel):
     id: str
     project: str
@@ -54,5 +67,7 @@ class RunSummary(BaseModel):
 
 class RunDetail(RunSummary):
     events: list[dict]
+    # Pass back as ?cursor= to fetch the next page; None on the last page
+    next_cursor: Optional[str] = None
 
 
@@ -0,0 +1,121 @@
+"""
+Group-commit writer for the ingest endpoints.
+
+Handlers submit a write to a queue and await its outcome; a single background
+task drains whatever has accumulated and applies it in one transaction, so
+concurrent ingests share a commit instead of paying one fsync each.
+"""
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .db import WriteSessionLocal
+
+
+ApplyFn = Callable[[AsyncSession, Any], Awaitable[Any]]
+_Item = Tuple[ApplyFn, Any, "asyncio.Future[Any]"]
+
+MAX_BATCH = 200
+QUEUE_SIZE = 10_000
+
+_event_queue: Optional["asyncio.Queue[_Item]"] = None
+_writer: Optional["asyncio.Task[None]"] = None
+
+
+async def _commit_batch(batch: List[_Item]) -> None:
+    results: Dict[int, Any] = {}
+    async with WriteSessionLocal() as session:
+        for i, (apply, payload, fut) in enumerate(batch):
+            try:
+                # Each item gets a savepoint, flushed inside it, so an item
+                # that fails (validation or database error) is rolled back
+                # on its own and the rest of the batch still commits.
+                async with session.begin_nested():
+                    results[i] = await apply(session, payload)
+                    await session.flush()
+            except Exception as e:
+                if not fut.done():
+                    fut.set_exception(e)
+        try:
+            await session.commit()
+        except Exception as e:
+            await session.rollback()
+            for _, _, fut in batch:
+                if not fut.done():
+                    fut.set_exception(e)
+            return
+    for i, (_, _, fut) in enumerate(batch):
+        if not fut.done():
+            fut.set_result(results.get(i))
+
+
+async def _writer_task() -> None:
+    assert _event_queue is not None
+    queue = _event_queue
+    while True:
+        batch = [await queue.get()]
+        # Everything that queued up while the previous batch was committing
+        # rides along in this one.
+        while len(batch) < MAX_BATCH:
+            try:
+                batch.append(queue.get_nowait())
+            except asyncio.QueueEmpty:
+                break
+        try:
+            await _commit_batch(batch)
+        except Exception as e:
+            for _, _, fut in batch:
+                if not fut.done():
+                    fut.set_exception(e)
+        finally:
+            for _ in batch:
+                queue.task_done()
+
+
+async def submit(apply: ApplyFn, payload: Any) -> Any:
+    """Apply a write through the batching writer and wait until it is committed.
+
+    Returns whatever ``apply`` returned.
+    """
+    if _event_queue is None:
+        return await _write_direct(apply, payload)
+    fut: "asyncio.Future[Any]" = asyncio.get_running_loop().create_future()
+    try:
+        _event_queue.put_nowait((apply, payload, fut))
+    except asyncio.QueueFull:
+        # Backlogged writer: commit inline rather than make the caller wait
+        # behind the whole queue or drop the event.
+        return await _write_direct(apply, payload)
+    return await fut
+
+
+async def _write_direct(apply: ApplyFn, payload: Any) -> Any:
+    async with WriteSessionLocal() as session:
+        result = await apply(session, payload)
+        await session.commit()
+    return result
+
+
+def start_writer() -> None:
+    global _event_queue, _writer
+    if _writer is not None:
+        return
+    _event_queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+    _writer = asyncio.create_task(_writer_task())
+
+
+async def stop_writer() -> None:
+    global _event_queue, _writer
+    if _writer is None or _event_queue is None:
+        return
+    await _event_queue.join()
+    _writer.cancel()
+    try:
+        await _writer
+    except asyncio.CancelledError:
+        pass
+    _event_queue = None
+    _writer = None
@@ -34,7 +34,7 @@ type Event = {
   error?: string
 }
 
-type RunDetail = RunSummary & { events: Event[] }
+type RunDetail = RunSummary & { events: Event[]; next_cursor?: string | null }
 
 const API_URL = (import.meta as any).env.VITE_API_URL || 'http://localhost:8000'
 
@@ -51,7 +51,22 @@ export function App() {
 
   useEffect(() => {
     if (!selected) return
-    fetch(`${API_URL}/v1/runs/${selected}`).then(r => r.json()).then(setDetail).catch(() => setDetail(null))
+    let cancelled = false
+    // The API pages events; follow next_cursor until the run is complete
+    const loadRun = async (runId: string): Promise<RunDetail> => {
+      const url = `${API_URL}/v1/runs/${runId}?limit=1000`
+      let page: RunDetail = await fetch(url).then(r => r.json())
+      const events = [...page.events]
+      while (page.next_cursor) {
+        page = await fetch(`${url}&cursor=${encodeURIComponent(page.next_cursor)}`).then(r => r.json())
+        events.push(...page.events)
+      }
+      return { ...page, events }
+    }
+    loadRun(selected)
+      .then(d => { if (!cancelled) setDetail(d) })
+      .catch(() => { if (!cancelled) setDetail(null) })
+    return () => { cancelled = true }
   }, [selected])
 
   const deleteRun = async (runId: string) => {
@@ -13,11 +13,13 @@ def init(
     project: Optional[str] = None,
     max_llm_calls: int = 5,
     monitor_http: bool = True,
+    telemetry_enabled: bool = True,
 ) -> None:
     config.server_url = server_url.rstrip("/")
     config.api_key = api_key
     config.project = project or "default"
     config.max_llm_calls = max(1, int(max_llm_calls))
+    config.telemetry_enabled = bool(telemetry_enabled)
 
     try:
         from .patches.openai_v1 import patch_openai
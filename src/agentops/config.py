@@ -1,20 +1,25 @@
 from __future__ import annotations
 
+import sys
 from dataclasses import dataclass
 from typing import Optional
 
 
-@dataclass
+# Slotted instances skip the per-instance __dict__, which makes the
+# attribute reads on every patched call cheaper (slots= needs Python 3.10).
+_DATACLASS_OPTIONS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_DATACLASS_OPTIONS)
 class Config:
     server_url: str = "http://localhost:8000"
     api_key: Optional[str] = None
     project: str = "default"
     max_llm_calls: int = 5
+    telemetry_enabled: bool = True
 
     run_id: Optional[str] = None
     terminated: bool = False
 
 
 config: Config = Config()
-
-
@@ -9,18 +9,20 @@ class AgentTerminatedError(RuntimeError):
     pass
 
 
-def enforce_max_calls() -> None:
-    ensure_run_started()
+def enforce_max_calls() -> str:
+    """Count an LLM call against the limit; returns the active run id."""
+    run_id = ensure_run_started()
     seq = next_sequence()
     if seq > config.max_llm_calls:
         post_event(
             {
                 "type": "run_terminated",
-                "run_id": config.run_id,
+                "run_id": run_id,
                 "reason": "UNBOUNDED_RECURSION",
                 "terminated_at": None,
             }
         )
         raise AgentTerminatedError("Unbounded Recursion: max LLM calls exceeded")
+    return run_id
 
 
@@ -2,43 +2,68 @@
 HTTP A2A monitoring for requests and httpx libraries.
 """
 import time
-import json
+from functools import lru_cache
 from typing import Any, Dict, Optional
-from urllib.parse import urlparse
+from urllib.parse import urlsplit
 
-from ..transport import post_event
-from ..runtime import current_run_id
+from .._json import dumps
+from ..transport import is_enabled, post_event
+from ..runtime import _now_ms, current_run_id
+
+
+def _url_netloc(url: str) -> str:
+    """Cheap netloc slice: the text between '//' and the next '/', '?' or '#'."""
+    start = url.find('//')
+    start = 0 if start < 0 else start + 2
+    end = len(url)
+    for sep in '/?#':
+        i = url.find(sep, start, end)
+        if i != -1:
+            end = i
+    return url[start:end]
 
 
 def _extract_service_name(url: str) -> str:
     """Extract a clean service name from URL."""
+    # Keyed by host so that paths and query strings don't defeat the cache
+    return _service_name_for_netloc(_url_netloc(url))
+
+
+# Registered domain (last two DNS labels) -> service name
+_SERVICE_DOMAINS = {
+    'stripe.com': 'stripe',
+    'openai.com': 'openai',
+    'anthropic.com': 'anthropic',
+    'googleapis.com': 'google_apis',
+    'amazonaws.com': 'aws',
+}
+
+
+@lru_cache(maxsize=1024)
+def _service_name_for_netloc(netloc: str) -> str:
+    """Map a URL netloc to a service name (memoized; agents hit few hosts)."""
     try:
-        parsed = urlparse(url)
-        domain = parsed.netloc.lower()
-        
-        # Remove common prefixes/suffixes
-        domain = domain.replace('www.', '').replace('api.', '')
-        
+        parsed = urlsplit('//' + netloc)
+        hostname = parsed.hostname or ''
+
         # Handle common services
-        if 'stripe.com' in domain:
-            return 'stripe'
-        elif 'openai.com' in domain:
-            return 'openai'
-        elif 'anthropic.com' in domain:
-            return 'anthropic'
-        elif 'googleapis.com' in domain:
-            return 'google_apis'
-        elif 'amazonaws.com' in domain:
-            return 'aws'
-        elif 'internal' in domain or 'localhost' in domain:
-            return f'internal_{parsed.hostname}'
-        else:
-            # Use the main domain
-            return domain.split('.')[0] if '.' in domain else domain
+        service = _SERVICE_DOMAINS.get('.'.join(hostname.rsplit('.', 2)[-2:]))
+        if service is not None:
+            return service
+
+        # Remove common prefixes/suffixes
+        domain = parsed.netloc.lower().replace('www.', '').replace('api.', '')
+        if 'internal' in domain or 'localhost' in domain:
+            return f'internal_{hostname}'
+        # Use the main domain
+        return domain.split('.')[0] if '.' in domain else domain
     except Exception:
         return 'unknown_service'
 
 
+_TRUNC_SUFFIX = "...[truncated]"
+
+
 def _safe_serialize(data: Any, max_length: int = 1000) -> Optional[str]:
     """Safely serialize data with length limits."""
     try:
@@ -46,20 +71,59 @@ def _safe_serialize(data: Any, max_length: int = 1000) -> Optional[str]:
             return None
         
         # Convert to string representation
-        if isinstance(data, (dict, list)):
-            serialized = json.dumps(data, default=str)
+        if isinstance(data, str):
+            serialized = data
+        elif isinstance(data, (bytes, bytearray)):
+            # Raw bodies: decode only the head rather than repr() the whole thing
+            serialized = _decode_head(data, None, max_length)
+        elif isinstance(data, (dict, list)):
+            encoded = dumps(data)
+            if len(encoded) > max_length:
+                # Cut the bytes before decoding; a split multi-byte char is dropped
+                return encoded[:max_length].decode("utf-8", "ignore") + _TRUNC_SUFFIX
+            return encoded.decode("utf-8")
         else:
             serialized = str(data)
         
         # Truncate if too long
         if len(serialized) > max_length:
-            serialized = serialized[:max_length] + "...[truncated]"
+            serialized = serialized[:max_length] + _TRUNC_SUFFIX
         
         return serialized
     except Exception:
         return "[unable to serialize]"
 
 
+def _decode_head(content: bytes, encoding: Optional[str], max_length: int) -> str:
+    # No supported encoding needs more than 4 bytes per char, so this head
+    # still decodes to more than max_length chars whenever the body does.
+    head = content[: 4 * (max_length + 1)]
+    try:
+        return head.decode(encoding or "utf-8", "replace")
+    except LookupError:
+        return head.decode("utf-8", "replace")
+
+
+def _response_preview(response: Any, max_length: int = 1000) -> Optional[str]:
+    """Decode just enough of a response body for _safe_serialize to truncate."""
+    try:
+        content = response.content
+    except Exception:
+        return None  # streamed httpx body that the caller hasn't read
+    return _decode_head(content, response.encoding, max_length)
+
+
+def _request_preview(request: Any, max_length: int = 1000) -> Optional[str]:
+    """Like _response_preview, for the body of an httpx.Request."""
+    try:
+        content = request.content
+    except Exception:
+        return None  # streaming request body
+    if not content:
+        return None
+    return _decode_head(content, None, max_length)
+
+
 def _log_http_call(
     method: str,
     url: str,
@@ -70,11 +134,13 @@ def _log_http_call(
     error: Optional[str] = None
 ):
     """Log an HTTP A2A communication event."""
+    if not is_enabled():
+        return
     run_id = current_run_id()
     if not run_id:
         return  # No active run
     
-    service_name = _extract_service_name(url)
+    service_name = _extract_service_name(str(url))
     
     event_data = {
         "run_id": run_id,
@@ -87,133 +153,138 @@ def _log_http_call(
         "status_code": status_code,
         "duration_ms": round(duration_ms, 2),
         "error": error,
-        "created_at": int(time.time() * 1000)
+        "created_at": _now_ms()
     }
     
-    # Send event asynchronously (best effort)
-    try:
-        post_event(event_data)
-    except Exception:
-        pass  # Don't break the user's code if monitoring fails
+    # Queued for the background sender; post_event drops rather than raises
+    post_event(event_data)
+
+
+def _should_log() -> bool:
+    # Checked before a call so that, with nothing to log it to, the wrappers
+    # skip the timing and body previews as well as the event itself.
+    return is_enabled() and bool(current_run_id())
+
+
+def _wrap_http_method(original_method, method_name: str):
+    """Wrap a top-level requests/httpx verb function so each call is logged."""
+
+    def wrapper(*args, **kwargs):
+        if not _should_log():
+            return original_method(*args, **kwargs)
+        start_ns = time.perf_counter_ns()
+        url = args[0] if args else kwargs.get('url', '')
+        request_data = kwargs.get('data') or kwargs.get('json')
+
+        try:
+            # Make the actual request
+            response = original_method(*args, **kwargs)
+        except Exception as e:
+            # Log failed request
+            _log_http_call(
+                method=method_name,
+                url=url,
+                request_data=request_data,
+                error=str(e),
+                duration_ms=(time.perf_counter_ns() - start_ns) / 1e6
+            )
+            raise
+
+        # Log successful request
+        _log_http_call(
+            method=method_name,
+            url=url,
+            request_data=request_data,
+            # Reading a requests stream=True body would consume it
+            response_data=None if kwargs.get('stream') else _response_preview(response),
+            status_code=response.status_code,
+            duration_ms=(time.perf_counter_ns() - start_ns) / 1e6
+        )
+        return response
+
+    return wrapper
+
+
+_HTTP_VERBS = ('get', 'post', 'put', 'delete', 'patch')
+
+
+def _patch_library(lib, verbs=_HTTP_VERBS) -> None:
+    """Replace each top-level verb function of ``lib`` with a monitored one."""
+    for verb in verbs:
+        setattr(lib, verb, _wrap_http_method(getattr(lib, verb), verb.upper()))
 
 
 def patch_requests():
     """Patch the requests library for HTTP monitoring."""
     try:
         import requests
-        
-        # Store original methods
-        original_get = requests.get
-        original_post = requests.post
-        original_put = requests.put
-        original_delete = requests.delete
-        original_patch = requests.patch
-        
-        def make_wrapper(original_method, method_name):
-            def wrapper(*args, **kwargs):
-                start_time = time.time()
-                url = args[0] if args else kwargs.get('url', '')
-                request_data = kwargs.get('data') or kwargs.get('json')
-                
-                try:
-                    # Make the actual request
-                    response = original_method(*args, **kwargs)
-                    
-                    # Log successful request
-                    _log_http_call(
-                        method=method_name,
-                        url=url,
-                        request_data=request_data,
-                        response_data=response.text,
-                        status_code=response.status_code,
-                        duration_ms=(time.time() - start_time) * 1000
-                    )
-                    
-                    return response
-                    
-                except Exception as e:
-                    # Log failed request
-                    _log_http_call(
-                        method=method_name,
-                        url=url,
-                        request_data=request_data,
-                        error=str(e),
-                        duration_ms=(time.time() - start_time) * 1000
-                    )
-                    raise
-            
-            return wrapper
-        
-        # Apply patches
-        requests.get = make_wrapper(original_get, 'GET')
-        requests.post = make_wrapper(original_post, 'POST')
-        requests.put = make_wrapper(original_put, 'PUT')
-        requests.delete = make_wrapper(original_delete, 'DELETE')
-        requests.patch = make_wrapper(original_patch, 'PATCH')
-        
     except ImportError:
-        pass  # requests not installed
+        return  # requests not installed
+
+    _patch_library(requests)
 
 
 def patch_httpx():
     """Patch the httpx library for HTTP monitoring."""
     try:
         import httpx
-        
-        # Store original methods
-        original_get = httpx.get
-        original_post = httpx.post
-        original_put = httpx.put
-        original_delete = httpx.delete
-        original_patch = httpx.patch
-        
-        def make_wrapper(original_method, method_name):
-            def wrapper(*args, **kwargs):
-                start_time = time.time()
-                url = args[0] if args else kwargs.get('url', '')
-                request_data = kwargs.get('data') or kwargs.get('json')
-                
-                try:
-                    # Make the actual request
-                    response = original_method(*args, **kwargs)
-                    
-                    # Log successful request
-                    _log_http_call(
-                        method=method_name,
-                        url=url,
-                        request_data=request_data,
-                        response_data=response.text,
-                        status_code=response.status_code,
-                        duration_ms=(time.time() - start_time) * 1000
-                    )
-                    
-                    return response
-                    
-                except Exception as e:
-                    # Log failed request
-                    _log_http_call(
-                        method=method_name,
-                        url=url,
-                        request_data=request_data,
-                        error=str(e),
-                        duration_ms=(time.time() - start_time) * 1000
-                    )
-                    raise
-            
-            return wrapper
-        
-        # Apply patches
-        httpx.get = make_wrapper(original_get, 'GET')
-        httpx.post = make_wrapper(original_post, 'POST')
-        httpx.put = make_wrapper(original_put, 'PUT')
-        httpx.delete = make_wrapper(original_delete, 'DELETE')
-        httpx.patch = make_wrapper(original_patch, 'PATCH')
-        
     except ImportError:
-        pass  # httpx not installed
+        return  # httpx not installed
+
+    _patch_library(httpx)
+
+
+def _wrap_async_send(original_send):
+    """Wrap httpx.AsyncClient.send, which every AsyncClient verb goes through."""
+
+    async def send(self, request, *args, **kwargs):
+        if not _should_log():
+            return await original_send(self, request, *args, **kwargs)
+        start_ns = time.perf_counter_ns()
+        try:
+            response = await original_send(self, request, *args, **kwargs)
+        except Exception as e:
+            _log_http_call(
+                method=request.method,
+                url=str(request.url),
+                request_data=_request_preview(request),
+                error=str(e),
+                duration_ms=(time.perf_counter_ns() - start_ns) / 1e6
+            )
+            raise
+
+        _log_http_call(
+            method=request.method,
+            url=str(request.url),
+            request_data=_request_preview(request),
+            response_data=_response_preview(response),
+            status_code=response.status_code,
+            duration_ms=(time.perf_counter_ns() - start_ns) / 1e6
+        )
+        return response
+
+    return send
+
+
+def patch_httpx_async():
+    """Patch httpx.AsyncClient so async HTTP calls are monitored as well."""
+    try:
+        import httpx
+    except ImportError:
+        return  # httpx not installed
+
+    httpx.AsyncClient.send = _wrap_async_send(httpx.AsyncClient.send)
+
+
+_patched = False
 
 
 def patch_http_libraries():
     """Patch all HTTP libraries for A2A monitoring."""
+    global _patched
+    if _patched:
+        return  # init() may run more than once; don't wrap the wrappers
     patch_requests()
     patch_httpx()
+    patch_httpx_async()
+    _patched = True
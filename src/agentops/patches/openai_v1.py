@@ -2,10 +2,8 @@ from __future__ import annotations
 
 from typing import Any, Dict, List, Optional
 
-from ..config import config
 from ..guardrails import enforce_max_calls
-from ..runtime import ensure_run_started
-from ..transport import post_event
+from ..transport import post_event_lazy
 
 
 _patched = False
@@ -31,6 +29,34 @@ def _estimate_cost(model: str, prompt_tokens: int, completion_tokens: int) -> fl
     return prompt_tokens * input_price + completion_tokens * output_price
 
 
+def _llm_call_event(run_id: str, model: Optional[str], messages: List[Dict[str, Any]], resp: Any) -> Dict[str, Any]:
+    usage = getattr(resp, "usage", None)
+    prompt_tokens = int(getattr(usage, "prompt_tokens", 0) or 0)
+    completion_tokens = int(getattr(usage, "completion_tokens", 0) or 0)
+    total_tokens = int(getattr(usage, "total_tokens", prompt_tokens + completion_tokens) or 0)
+    content = ""
+    try:
+        content = resp.choices[0].message.content  # type: ignore[attr-defined]
+    except Exception:
+        content = ""
+
+    cost_usd = _estimate_cost(model or "", prompt_tokens, completion_tokens)
+
+    return {
+        "type": "llm_call",
+        "run_id": run_id,
+        "seq": None,
+        "model": model,
+        "prompt": _extract_prompt(messages),
+        "response": content,
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": total_tokens,
+        "cost_usd": cost_usd,
+        "created_at": None,
+    }
+
+
 def patch_openai() -> None:
     global _patched
     if _patched:
@@ -43,43 +69,15 @@ def patch_openai() -> None:
     original_create = Completions.create
 
     def wrapped_create(self, *args, **kwargs):  # type: ignore[no-redef]
-        enforce_max_calls()
-        ensure_run_started()
+        run_id = enforce_max_calls()
 
         model: Optional[str] = kwargs.get("model")
         messages: Optional[List[Dict[str, Any]]] = kwargs.get("messages")
-        prompt_text = _extract_prompt(messages or [])
 
         resp = original_create(self, *args, **kwargs)
 
         try:
-            usage = getattr(resp, "usage", None)
-            prompt_tokens = int(getattr(usage, "prompt_tokens", 0) or 0)
-            completion_tokens = int(getattr(usage, "completion_tokens", 0) or 0)
-            total_tokens = int(getattr(usage, "total_tokens", prompt_tokens + completion_tokens) or 0)
-            content = ""
-            try:
-                content = resp.choices[0].message.content  # type: ignore[attr-defined]
-            except Exception:
-                content = ""
-
-            cost_usd = _estimate_cost(model or "", prompt_tokens, completion_tokens)
-
-            post_event(
-                {
-                    "type": "llm_call",
-                    "run_id": config.run_id,
-                    "seq": None,
-                    "model": model,
-                    "prompt": prompt_text,
-                    "response": content,
-                    "prompt_tokens": prompt_tokens,
-                    "completion_tokens": completion_tokens,
-                    "total_tokens": total_tokens,
-                    "cost_usd": cost_usd,
-                    "created_at": None,
-                }
-            )
+            post_event_lazy(lambda: _llm_call_event(run_id, model, messages or [], resp))
         except Exception:
             pass
 
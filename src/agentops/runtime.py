@@ -4,44 +4,51 @@ import threading
 import time
 import uuid
 from contextlib import contextmanager
+from contextvars import ContextVar
 from typing import Iterator, Optional
 
 from .config import config
 from .transport import post_event
 
 
-_local = threading.local()
+class _ThreadState(threading.local):
+    # __init__ runs once per thread on first access, so seq always exists
+    def __init__(self) -> None:
+        self.seq = 0
 
 
-def _now_ms() -> int:
-    return int(time.time() * 1000)
+_local = _ThreadState()
+# Per thread and per asyncio task, so concurrent runs don't see each other's id
+_run_id_var: ContextVar[Optional[str]] = ContextVar("agentops_run_id", default=None)
 
 
-def _get_seq_counter() -> int:
-    if not hasattr(_local, "seq"):
-        _local.seq = 0
-    return _local.seq
+_time_ns = time.time_ns
+
+
+def _now_ms() -> int:
+    # Integer clock: no float rounding, no float->int conversion
+    return _time_ns() // 1_000_000
 
 
 def next_sequence() -> int:
-    seq = _get_seq_counter() + 1
-    _local.seq = seq
-    return seq
+    _local.seq += 1
+    return _local.seq
 
 
 def current_run_id() -> Optional[str]:
-    return getattr(_local, "run_id", None) or config.run_id
+    return _run_id_var.get() or config.run_id
 
 
 def _set_run_id(run_id: str) -> None:
-    _local.run_id = run_id
+    _run_id_var.set(run_id)
     config.run_id = run_id
 
 
 @contextmanager
 def RunContext(project: Optional[str] = None) -> Iterator[str]:
     run_id = str(uuid.uuid4())
-    _set_run_id(run_id)
+    token = _run_id_var.set(run_id)
+    config.run_id = run_id
     post_event(
         {
             "type": "run_started",
@@ -55,7 +62,7 @@ def RunContext(project: Optional[str] = None) -> Iterator[str]:
     finally:
         post_event({"type": "run_completed", "run_id": run_id, "ended_at": _now_ms()})
         _local.seq = 0
-        _local.run_id = None
+        _run_id_var.reset(token)
 
 
 def ensure_run_started() -> str:
@@ -1,28 +1,180 @@
 from __future__ import annotations
 
-import json
-from typing import Any, Dict
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import httpx
 
+from ._json import dumps
 from .config import config
 
+try:
+    import brotli
+except ImportError:
+    brotli = None  # type: ignore[assignment]
+
+
+logger = logging.getLogger(__name__)
+
+_QUEUE_MAXSIZE = 4096
+_MAX_BATCH = 256
+# How long the worker waits for a batch to fill up before sending it
+_FLUSH_INTERVAL_S = 0.5
+_FLUSH_TIMEOUT_S = 2.0
+_DROP_WARNING_INTERVAL_S = 60.0
+# Below this size compression saves less than it costs
+_COMPRESS_MIN_BYTES = 1024
+
+_queue: "queue.Queue[Dict[str, Any]]" = queue.Queue(maxsize=_QUEUE_MAXSIZE)
+_worker: Optional[threading.Thread] = None
+_worker_lock = threading.Lock()
+_client: Optional[httpx.Client] = None
+_dropped = 0
+_last_drop_warning = 0.0
+# Batch URL and Authorization header, with the (server_url, api_key) they
+# were built from
+_target_key: Optional[Tuple[str, Optional[str]]] = None
+_target: Tuple[str, Dict[str, str]] = ("", {})
+
+
+def is_enabled() -> bool:
+    return config.telemetry_enabled
+
 
 def post_event(event: Dict[str, Any]) -> None:
+    """Queue an event for the background sender; never blocks the caller."""
+    global _dropped
+    if not config.telemetry_enabled:
+        return
+    _ensure_worker()
     try:
-        headers = {"Content-Type": "application/json"}
-        if config.api_key:
-            headers["Authorization"] = f"Bearer {config.api_key}"
-        
-        # Determine endpoint based on event type
-        if event.get("type", "").startswith("a2a_"):
-            url = f"{config.server_url}/v1/a2a-events"
-        else:
-            url = f"{config.server_url}/v1/events"
-            
-        with httpx.Client(timeout=3.0) as client:
-            client.post(url, content=json.dumps(event), headers=headers)
-    except Exception:
-        pass
+        _queue.put_nowait(event)
+    except queue.Full:
+        _dropped += 1
+        _warn_dropped()
+
+
+def post_event_lazy(supplier: Callable[[], Dict[str, Any]]) -> None:
+    """Like post_event, but the event is only built when telemetry is on."""
+    if config.telemetry_enabled:
+        post_event(supplier())
+
+
+def flush(timeout: float = _FLUSH_TIMEOUT_S) -> None:
+    """Wait up to ``timeout`` seconds for queued events to be sent."""
+    deadline = time.monotonic() + timeout
+    with _queue.all_tasks_done:
+        while _queue.unfinished_tasks:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            _queue.all_tasks_done.wait(remaining)
+
+
+def _ensure_worker() -> None:
+    global _worker
+    if _worker is not None:
+        return
+    with _worker_lock:
+        if _worker is None:
+            worker = threading.Thread(target=_drain, name="agentops-transport", daemon=True)
+            worker.start()
+            atexit.register(flush)
+            _worker = worker
+
 
+def _reset_after_fork() -> None:
+    # A forked child inherits the worker's globals but not its thread; start
+    # over so the child spawns its own worker and connection. Events the
+    # parent had queued are the parent's to send.
+    global _queue, _worker, _worker_lock, _client
+    _queue = queue.Queue(maxsize=_QUEUE_MAXSIZE)
+    _worker = None
+    _worker_lock = threading.Lock()
+    _client = None
 
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def _warn_dropped() -> None:
+    global _last_drop_warning
+    now = time.monotonic()
+    if now - _last_drop_warning >= _DROP_WARNING_INTERVAL_S:
+        _last_drop_warning = now
+        logger.warning("agentops: event queue full, %d events dropped so far", _dropped)
+
+
+def _drain() -> None:
+    while True:
+        batch = [_queue.get()]
+        deadline = time.monotonic() + _FLUSH_INTERVAL_S
+        while len(batch) < _MAX_BATCH:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining > 0:
+                    batch.append(_queue.get(timeout=remaining))
+                else:
+                    batch.append(_queue.get_nowait())
+            except queue.Empty:
+                break
+        try:
+            _send_batch(batch)
+        finally:
+            for _ in batch:
+                _queue.task_done()
+
+
+def _get_client() -> httpx.Client:
+    # Only the worker thread sends, so the client needs no locking; keeping
+    # it open lets batches reuse the same connection.
+    global _client
+    if _client is None:
+        try:
+            import h2  # noqa: F401
+            http2 = True
+        except ImportError:
+            http2 = False
+        _client = httpx.Client(
+            http2=http2,
+            timeout=3.0,
+            limits=httpx.Limits(max_keepalive_connections=4),
+        )
+    return _client
+
+
+def _encode_batch(batch: List[Dict[str, Any]]) -> Tuple[bytes, Dict[str, str]]:
+    body = dumps({"events": batch})
+    headers = {"Content-Type": "application/json"}
+    if brotli is not None and len(body) >= _COMPRESS_MIN_BYTES:
+        body = brotli.compress(body, quality=4)
+        headers["Content-Encoding"] = "br"
+    return body, headers
+
+
+def _get_target() -> Tuple[str, Dict[str, str]]:
+    # Rebuilt only when init() changes the server or the key
+    global _target_key, _target
+    key = (config.server_url, config.api_key)
+    if key != _target_key:
+        server_url, api_key = key
+        auth = {"Authorization": f"Bearer {api_key}"} if api_key else {}
+        _target = (f"{server_url}/v1/events/batch", auth)
+        _target_key = key
+    return _target
+
+
+def _send_batch(batch: List[Dict[str, Any]]) -> None:
+    try:
+        body, headers = _encode_batch(batch)
+        url, auth = _get_target()
+        headers.update(auth)
+        _get_client().post(url, content=body, headers=headers)
+    except Exception:
+        pass